@@ -15,7 +15,6 @@
 
 """Quantized and optionally sparsified Linear Layers."""
 
-import copy
 from typing import Any, Sequence, Tuple
 
 from jax import numpy as jnp
@@ -48,9 +47,16 @@ class Linear(  # pytype: disable=signature-mismatch
       such as the mode for the quantization.
     rank: Rank to factorize to low-weights. Set to -1 to disable low-rank
       factorization.
+    low_rank_init: Initialization of the low-rank factors. `random` draws
+      w_a and w_b independently with the layer's params_init. `svd` draws one
+      full [input_dims, output_dims] weight with params_init and initializes
+      the factors from its truncated SVD, w_a = U sqrt(S), w_b = sqrt(S) Vh,
+      so their product is distributed like a full-rank weight and the
+      residual quantization must absorb is smaller.
   """
   _PACK_4BIT_DIM = 0
   rank: int = -1
+  low_rank_init: str = 'random'
 
   def _get_sub_channel_shape(
       self, shape: Sequence[int], block_size: int, contract_dim: int
@@ -66,10 +72,12 @@ class Linear(  # pytype: disable=signature-mismatch
           f'block_size {block_size} must fully divide shape[contract_dim]'
           f' {shape}[{contract_dim}]'
       )
-    out_shape = list(shape)
-    out_shape.insert(contract_dim, sub_channels)
-    out_shape[contract_dim + 1] = block_size
-    return out_shape
+    return (
+        *shape[:contract_dim],
+        sub_channels,
+        block_size,
+        *shape[contract_dim + 1 :],
+    )
 
   def _sub_channel_block_size(self) -> int:
     """Determine sub-channels' block_size if it was given."""
@@ -92,13 +100,17 @@ class Linear(  # pytype: disable=signature-mismatch
 
     With Sub-channel, both the weight and the scale are sharded along the
     sub-channel dimension.
+
+    Both variants only depend on static layer hparams; setup caches them on
+    self._weight_hparams_cache so quantized_partition_specs, which is called
+    per-layer and per-mesh-axis at serving prep, does not rebuild them.
+    Consumers of the cache must not mutate the results.
     """
     wp = self.weight_split_dims_mapping
     weight_shape = [self.input_dims, self.output_dims]
     scale_shape = [self.output_dims]
-    block_size = self._sub_channel_block_size()
     if using_sub_channel:
-      weight_shape = self._get_sub_channel_shape(weight_shape, block_size, 0)
+      weight_shape = self._sub_channel_shape_w
       scale_shape = [weight_shape[0], weight_shape[2]]
       if wp.wt is not None:
         weight_sharding = wp.wt.copy()
@@ -126,7 +138,128 @@ class Linear(  # pytype: disable=signature-mismatch
     )
     return (weight_hparams, scale_hparams)
 
+  def _select_weight_quantize_fn(self):
+    """Binds the weight-quantization closure for this layer's static hparams.
+
+    quantize_weight branches on quantization type and weight params, all of
+    which are fixed per layer. Resolving the branch once here leaves only the
+    tensor computation on the per-call path.
+    """
+    if self.quantization is None:
+      return None
+    weight_params = self.quantization.weight_params
+    pack_4bit_weights = (
+        weight_params.precision == 4 and weight_params.use_int4_packed_weights
+    )
+    if self.quantization.quantization_type in [
+        QuantizationType.PTQ,
+        QuantizationType.FQ,
+        QuantizationType.FQ_VN,
+    ]:
+
+      def quantize_fn(w, contract_dims):
+        if pack_4bit_weights:
+          # Fused 4-bit quantize-and-pack; the int8 intermediate is never
+          # materialized.
+          q_w, q_s, zp = operations.reduce_precision_packed(
+              w,
+              contract_dims,
+              pack_dim=self._PACK_4BIT_DIM,
+              packed_dtype=(
+                  weight_params.int4_packed_weights_container_dtype
+              ),
+              percentile=weight_params.clipping_coeff,
+              use_symmetric=weight_params.use_symmetric,
+          )
+        else:
+          q_w, q_s, zp = operations.reduce_precision(
+              w,
+              contract_dims,
+              bits=weight_params.precision,
+              percentile=weight_params.clipping_coeff,
+              use_symmetric=weight_params.use_symmetric,
+          )
+        q_s = jnp.squeeze(q_s)
+        if zp is not None:
+          zp = jnp.squeeze(zp)
+        return q_w, q_s, zp
+
+    elif self.quantization.quantization_type == QuantizationType.AQT:
+
+      def quantize_fn(w, contract_dims):
+        q_w, q_s, zp = self.weight_quantizer.quantize(
+            w,
+            contract_dims,
+            squeeze_scale=True,
+            quantized_dtype=weight_params.dtype,
+        )
+        if pack_4bit_weights:
+          q_w = utils.pack_4bit(
+              q_w,
+              self._PACK_4BIT_DIM,
+              weight_params.int4_packed_weights_container_dtype,
+          )
+        return q_w, q_s, zp
+
+    else:
+      return None
+    return quantize_fn
+
+  def _init_low_rank_weights_svd(self) -> None:
+    """Replaces the w_a/w_b init values with a truncated SVD factorization.
+
+    Draws one full [input_dims, output_dims] weight with the layer's
+    params_init and overwrites the factors at init time. Only applies while
+    initializing and when the factors are stored unquantized.
+    """
+    if not self.is_initializing():
+      return
+    if (
+        self.quantization is not None
+        and self.quantization.mode == QuantizationMode.INFERENCE
+    ):
+      # Inference-mode factors are quantized containers loaded from a
+      # checkpoint; there is nothing meaningful to initialize here.
+      return
+    full_hparams = WeightHParams(
+        shape=[self.input_dims, self.output_dims],
+        init=self.params_init,
+        dtype=self.dtype,
+    )
+    w_full = base_layer.init_var(
+        full_hparams, self.next_prng_key(), self.scope.path_text + '/w_full'
+    )
+    w_a, w_b = operations.factorize_weight(w_full, self.rank, balanced=True)
+    for name, value in (('w_a', w_a), ('w_b', w_b)):
+      current = self.get_variable(base_layer.PARAMS, name)
+      if isinstance(current, base_layer.BoxedParam):
+        new_value = base_layer.BoxedParam(
+            value=value.astype(current.value.dtype), meta=current.meta
+        )
+      else:
+        new_value = value.astype(current.dtype)
+      self.put_variable(base_layer.PARAMS, name, new_value)
+
   def setup(self) -> None:
+    # Cache hparam-derived flags once; they are re-read on every __call__,
+    # quantize_weight and quantized_partition_specs otherwise.
+    self._block_size = self._sub_channel_block_size()
+    # Resolve the sub-channel weight shape (and its divisibility check) once;
+    # the per-call paths only reshape to the cached result.
+    self._sub_channel_shape_w = (
+        self._get_sub_channel_shape(
+            [self.input_dims, self.output_dims], self._block_size, 0
+        )
+        if self._block_size > 0
+        else None
+    )
+    # (per-channel, sub-channel) weight/scale hparams; see _get_weight_hparams.
+    self._weight_hparams_cache = (
+        self._get_weight_hparams(False),
+        self._get_weight_hparams(True) if self._block_size > 0 else None,
+    )
+    self._static_act_quant = self._do_static_activation_quantization()
+    self._weight_quantize_fn = self._select_weight_quantize_fn()
     wp = self.weight_split_dims_mapping
     if self.rank > 0:
       shape_a, shape_b = (
@@ -157,9 +290,13 @@ class Linear(  # pytype: disable=signature-mismatch
           pack_dim=self._PACK_4BIT_DIM,
       )
       self.create_aux_variables('w_b', wp_b)
+      if self.low_rank_init == 'svd':
+        self._init_low_rank_weights_svd()
+      elif self.low_rank_init != 'random':
+        raise ValueError(f'Unsupported low_rank_init {self.low_rank_init}.')
 
     else:
-      block_size = self._sub_channel_block_size()
+      block_size = self._block_size
       using_sub_channel = False
       if block_size > 0:
         self._PACK_4BIT_DIM = 1
@@ -167,9 +304,9 @@ class Linear(  # pytype: disable=signature-mismatch
             self.quantization is not None
             and self.quantization.mode == QuantizationMode.INFERENCE
         )
-      weight_hparams, scale_hparams = self._get_weight_hparams(
-          using_sub_channel
-      )
+      weight_hparams, scale_hparams = self._weight_hparams_cache[
+          1 if using_sub_channel else 0
+      ]
       self.set_up_weights(
           weight_name='w',
           weight_params=weight_hparams,
@@ -200,14 +337,17 @@ class Linear(  # pytype: disable=signature-mismatch
     }
 
     if self.rank > 0:
-      w_a = self.sparsifiy(self.theta.w_a, inputs=inputs, name='w_a')
+      w_a, w_b = self.sparsifiy_batched(
+          [self.theta.w_a, self.theta.w_b],
+          names=['w_a', 'w_b'],
+          inputs=inputs,
+      )
       intermediate = self.quantized_einsum(
           x=inputs,
           w=w_a,
           weight_name='w_a',
           **q_einsum_params,
       )
-      w_b = self.sparsifiy(self.theta.w_b, inputs=inputs, name='w_b')
       out = self.quantized_einsum(
           x=intermediate,
           w=w_b,
@@ -217,7 +357,7 @@ class Linear(  # pytype: disable=signature-mismatch
     else:
       w = self.sparsifiy(self.theta.w, inputs=inputs, name='w')
       # Sub-channel
-      block_size = self._sub_channel_block_size()
+      block_size = self._block_size
       if (
           self.quantization is not None
           and (
@@ -231,20 +371,19 @@ class Linear(  # pytype: disable=signature-mismatch
         #   c := block size, the contract dim
         # Inputs must be reshaped from ...y into ...sc.
         # Weights are stored in scz form, scale and offset are stored as sz.
-        inputs_shape = list(inputs.shape)
-        inputs = jnp.reshape(
-            inputs,
-            self._get_sub_channel_shape(
-                inputs_shape, block_size, len(inputs_shape) - 1
-            ),
-        )
+        inputs = jnp.reshape(inputs, inputs.shape[:-1] + (-1, block_size))
         q_einsum_params['eqn'] = '...sc,scz->...sz'
         q_einsum_params['scale_eqn'] = '...sz,sz->...z'
         q_einsum_params['zp_eqn'] = '...sc,sz->...z'
+        if (
+            self.quantization.weight_params.dtype == jnp.int8
+            and self._static_act_quant
+        ):
+          # Both operands are int8-backed; keep accumulation in int32 rather
+          # than letting the contraction upcast to float.
+          q_einsum_params['preferred_element_type'] = jnp.int32
         if len(w.shape) == 2:
-          q_einsum_params['reshape'] = self._get_sub_channel_shape(
-              list(w.shape), block_size, 0
-          )
+          q_einsum_params['reshape'] = [-1, block_size, *w.shape[1:]]
       out = self.quantized_einsum(
           x=inputs,
           w=w,
@@ -269,13 +408,20 @@ class Linear(  # pytype: disable=signature-mismatch
         ' model, please set quantized config for the model.'
     )
     scale_name = 'w' + base_layer.QUANTIZED_SCALE_NAME_POSTFIX
-    block_size = self._sub_channel_block_size()
-    weight_hparams, scale_hparams = self._get_weight_hparams(block_size > 0)
+    block_size = self._block_size
+    weight_hparams, scale_hparams = self._weight_hparams_cache[
+        1 if block_size > 0 else 0
+    ]
     # TODO(pax): This is a weird way to enforce scale replication.
     # We should fix related tests to use replicated scale for large models.
     if block_size == 0:
-      scale_hparams.shape = ()
-      scale_hparams.mesh_shape = None
+      # The cached hparams must not be mutated; a fresh zero-dim hparam with
+      # the same sharding gives an identical spec.
+      scale_hparams = WeightHParams(
+          shape=(),
+          mesh_shape=None,
+          tensor_split_dims_mapping=scale_hparams.tensor_split_dims_mapping,
+      )
     weight_pspec = base_layer._weight_hparam_to_pspec(  # pylint: disable=protected-access
         weight_hparams, self.mesh_axis_names
     )
@@ -286,10 +432,12 @@ class Linear(  # pytype: disable=signature-mismatch
 
     if not self.quantization.weight_params.use_symmetric:
       zp_name = 'w' + base_layer.QUANTIZED_ZP_NAME_POSTFIX
-      partitionspec[zp_name] = copy.deepcopy(scale_pspec)
+      # PartitionSpec is immutable, so the zero point can share the scale's
+      # spec directly.
+      partitionspec[zp_name] = scale_pspec
 
     # Activation variable partitioning is only needed for static quantization.
-    if self._do_static_activation_quantization():
+    if self._static_act_quant:
       raise NotImplementedError(
           'Static activation quantization is not supported yet.')
 
@@ -310,59 +458,25 @@ class Linear(  # pytype: disable=signature-mismatch
 
     w = self.theta.w
     contract_dims = [0]
-    block_size = self._sub_channel_block_size()
+    block_size = self._block_size
     if block_size > 0:
-      w = jnp.reshape(
-          w, self._get_sub_channel_shape(list(w.shape), block_size, 0)
-      )
+      w = jnp.reshape(w, self._sub_channel_shape_w)
       contract_dims = [1]
     calculation_dtype = self.dtype
 
-    if self.quantization.quantization_type in [
-        QuantizationType.PTQ,
-        QuantizationType.FQ,
-        QuantizationType.FQ_VN,
-    ]:
-      if self._do_static_activation_quantization():
-        raise NotImplementedError(
-            'Static activation quantization is not supported yet.'
-        )
-      else:
-        if w.dtype != calculation_dtype:
-          w = w.astype(calculation_dtype)
-        q_w, q_s, zp = operations.reduce_precision(
-            w,
-            contract_dims,
-            bits=self.quantization.weight_params.precision,
-            percentile=self.quantization.weight_params.clipping_coeff,
-            use_symmetric=self.quantization.weight_params.use_symmetric,
-        )
-        q_s = jnp.squeeze(q_s)
-        if zp is not None:
-          zp = jnp.squeeze(zp)
-    # Internal quantization type support.
-    elif self.quantization.quantization_type == QuantizationType.AQT:
-      if self._do_static_activation_quantization():
-        raise NotImplementedError(
-            'Static activation quantization is not supported yet.'
-        )
-      else:
-        q_w, q_s, zp = self.weight_quantizer.quantize(
-            w,
-            contract_dims,
-            squeeze_scale=True,
-            quantized_dtype=self.quantization.weight_params.dtype,
-        )
-
-    if (
-        self.quantization.weight_params.precision == 4
-        and self.quantization.weight_params.use_int4_packed_weights
-    ):
-      q_w = utils.pack_4bit(
-          q_w,
-          self._PACK_4BIT_DIM,
-          self.quantization.weight_params.int4_packed_weights_container_dtype,
+    if self._static_act_quant:
+      raise NotImplementedError(
+          'Static activation quantization is not supported yet.'
+      )
+    if self._weight_quantize_fn is None:
+      raise ValueError(
+          'Unsupported quantization_type'
+          f' {self.quantization.quantization_type}.'
       )
+    if self.quantization.quantization_type != QuantizationType.AQT:
+      if w.dtype != calculation_dtype:
+        w = w.astype(calculation_dtype)
+    q_w, q_s, zp = self._weight_quantize_fn(w, contract_dims)
 
     if self.quantization.weight_params.use_symmetric:
       return {base_layer.PARAMS: {'w': q_w, scale_name: q_s}}
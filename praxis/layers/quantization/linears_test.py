@@ -552,6 +552,52 @@ class FactorizedLinearTest(test_utils.TestCase):
       outputs = linear.apply(initial_vars, inputs)
     self.assertEqual(outputs.shape, (2, 4))
 
+  @parameterized.named_parameters(
+      ('1', 1),
+      ('2', 2),
+  )
+  def test_linear_factorized_svd_init(self, rank):
+    p = pax_fiddle.Config(
+        qlinears.Linear,
+        name='_linear',
+        input_dims=8,
+        output_dims=4,
+        rank=rank,
+        low_rank_init='svd',
+    )
+    linear = instantiate(p)
+    inputs = jnp.array(
+        [[1, 2, 3, 4, 5, 6, 7, 8], [9, 10, 11, 12, 13, 14, 15, 16]],
+        dtype=p.dtype,
+    )
+    with base_layer.JaxContext.new_context():
+      prng_key = jax.random.PRNGKey(seed=123)
+      initial_vars = linear.init(prng_key, inputs)
+      outputs = linear.apply(initial_vars, inputs)
+    self.assertEqual(outputs.shape, (2, 4))
+    w_a = initial_vars['params']['w_a']
+    w_b = initial_vars['params']['w_b']
+    self.assertEqual(w_a.shape, (8, rank))
+    self.assertEqual(w_b.shape, (rank, 4))
+    # The SVD split is balanced: the factors carry the singular values
+    # evenly, so their norms match.
+    self.assertAllClose(jnp.linalg.norm(w_a), jnp.linalg.norm(w_b))
+
+  def test_linear_factorized_bad_init(self):
+    p = pax_fiddle.Config(
+        qlinears.Linear,
+        name='_linear',
+        input_dims=8,
+        output_dims=4,
+        rank=2,
+        low_rank_init='qr',
+    )
+    linear = instantiate(p)
+    inputs = np.random.rand(2, 8).astype(np.float32)
+    with self.assertRaisesRegex(ValueError, 'Unsupported low_rank_init'):
+      with base_layer.JaxContext.new_context():
+        linear.init(jax.random.PRNGKey(seed=123), inputs)
+
 
 class SubChannelLinearTest(test_utils.TestCase):
 
@@ -189,6 +189,7 @@ def einsum(
     zp_act: JTensor | None = None,
     scale_eqn: str | None = None,
     zp_eqn: str | None = None,
+    preferred_element_type: jnp.dtype | None = None,
 ) -> JTensor:
   """Performs quantized einsum.
 
@@ -212,6 +213,10 @@ def einsum(
       einsum(scale_eqn, tmp, out). Default scale_eqn act as '...z,z->...z'
     zp_eqn: Optional. ret = scale_out - einsum(zp_eqn, x, zp) Default zp_eqn act
       as '...y,z->...z'
+    preferred_element_type: Optional accumulation type for the main
+      contraction, e.g. jnp.int32 to keep int8 x int8 accumulation in int32
+      without a float upcast. The integer dot_general path always accumulates
+      in int32.
 
   Returns:
     A JTensor.
@@ -257,7 +262,22 @@ def einsum(
     # Remove the following dtype casting of w once it's resolved.
     if w.dtype == jnp.int4:
       w = w.astype(jnp.int8)
-    ret = jnp.einsum(eqn_normalized, x, w)
+    if eqn == '...sc,scz->...sz':
+      # Batched-matmul form of the sub-channel contraction: (..., s, 1, c) @
+      # (s, c, z) -> (..., s, 1, z). Dispatches straight to dot_general
+      # rather than through einsum's general contraction machinery.
+      ret = jnp.squeeze(
+          jnp.matmul(
+              x[..., jnp.newaxis, :],
+              w,
+              preferred_element_type=preferred_element_type,
+          ),
+          axis=-2,
+      )
+    else:
+      ret = jnp.einsum(
+          eqn_normalized, x, w, preferred_element_type=preferred_element_type
+      )
 
   if scale_act is not None:
     if scale_act.ndim == 0:
@@ -383,6 +403,63 @@ def reduce_precision(
   return t, scale, zp
 
 
+def reduce_precision_packed(
+    t: JTensor,
+    contract_dims: Sequence[int] | None,
+    pack_dim: int,
+    packed_dtype: jnp.dtype = jnp.int32,
+    percentile: float = 1.0,
+    use_symmetric: bool = True,
+) -> tuple[JTensor, JTensor, JTensor | None]:
+  """Quantizes a tensor to 4 bits and packs nibbles in one jitted call.
+
+  Runs reduce_precision(..., bits=4) and utils.pack_4bit as a single jitted
+  computation. Under an enclosing jit the two ops fuse either way; this
+  helps eager callers (e.g. offline weight quantization through
+  quantize_weight), which would otherwise dispatch them separately and
+  materialize the int8 intermediate between the two.
+
+  Args:
+    t: Input tensor.
+    contract_dims: Specifies contracting dimensions of the input tensor.
+    pack_dim: Dimension to pack along.
+    packed_dtype: Container type to pack to, int32 or int8.
+    percentile: Percentile factor to apply on the min/max range.
+    use_symmetric: If the input tensor is quantized symmetrically.
+
+  Returns:
+    A tuple of packed quantized tensor, quantization scale
+      and quantization zero point (optional).
+  """
+  return _reduce_precision_packed(
+      t,
+      tuple(contract_dims) if contract_dims is not None else None,
+      pack_dim,
+      packed_dtype,
+      percentile,
+      use_symmetric,
+  )
+
+
+@functools.partial(jax.jit, static_argnums=(1, 2, 3, 4, 5))
+def _reduce_precision_packed(
+    t: JTensor,
+    contract_dims: tuple[int, ...] | None,
+    pack_dim: int,
+    packed_dtype: jnp.dtype,
+    percentile: float,
+    use_symmetric: bool,
+) -> tuple[JTensor, JTensor, JTensor | None]:
+  q_t, scale, zp = reduce_precision(
+      t,
+      contract_dims,
+      bits=4,
+      percentile=percentile,
+      use_symmetric=use_symmetric,
+  )
+  return utils.pack_4bit(q_t, pack_dim, packed_dtype), scale, zp
+
+
 def eqn_to_weight_contract_dims(eqn: str) -> list[int]:
   segs = eqn.split('->')
   ins = segs[0].split(',')
@@ -904,7 +981,9 @@ def fakequant_vn(
     return w + scale.astype(w.dtype) * noises  # pytype: disable=attribute-error
 
 
-def factorize_weight(var: JTensor, rank: int) -> tuple[JTensor, JTensor]:
+def factorize_weight(
+    var: JTensor, rank: int, balanced: bool = False
+) -> tuple[JTensor, JTensor]:
   """Apply SVD to variable and return two matrices.
 
   Args:
@@ -912,10 +991,13 @@ def factorize_weight(var: JTensor, rank: int) -> tuple[JTensor, JTensor]:
     rank: Inner rank of the factorized output. In terms of SVD, keeps top "rank"
 
   singular values and zeros out the rest.
+    balanced: If True, the square roots of the singular values are folded into
+      both matrices, i.e. U sqrt(S) and sqrt(S) Vh, which keeps the two
+      factors on comparable scales. Otherwise the singular values are folded
+      entirely into the second matrix.
 
   Returns:
     Two JTensors representing the truncated SVD version of var with rank "rank".
-  The singular values are folded into the second matrix.
   """
   u, s, vh = jnp.linalg.svd(var, full_matrices=False)
   u_truncated, s_truncated, vh_truncated = (
@@ -923,4 +1005,10 @@ def factorize_weight(var: JTensor, rank: int) -> tuple[JTensor, JTensor]:
       s[..., :rank],
       vh[..., :rank, :],
   )
+  if balanced:
+    s_sqrt = jnp.sqrt(s_truncated)
+    return (
+        jnp.einsum('...i,...ji->...ji', s_sqrt, u_truncated),
+        jnp.einsum('...i,...ij->...ij', s_sqrt, vh_truncated),
+    )
   return u_truncated, jnp.einsum('...i,...ij->...ij', s_truncated, vh_truncated)
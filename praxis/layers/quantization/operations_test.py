@@ -29,6 +29,7 @@ from praxis import test_utils
 from praxis.layers.quantization import operations
 from praxis.layers.quantization import quantization_hparams
 from praxis.layers.quantization import quantizer
+from praxis.layers.quantization import utils
 
 
 class QuantizationUtilsTest(test_utils.TestCase):
@@ -295,6 +296,28 @@ class ReducePrecisionTest(test_utils.TestCase):
       )
     self.assertIsNone(zp)
 
+  @parameterized.parameters(True, False)
+  def test_reduce_precision_packed(self, use_symmetric):
+    inputs = np.random.normal(size=[8, 4]).astype(np.float32)
+    qx, scale, zp = operations.reduce_precision(
+        inputs, contract_dims=[0], bits=4, use_symmetric=use_symmetric
+    )
+    qx_packed, scale_packed, zp_packed = operations.reduce_precision_packed(
+        inputs,
+        contract_dims=[0],
+        pack_dim=0,
+        packed_dtype=jnp.int32,
+        use_symmetric=use_symmetric,
+    )
+    self.assertArraysEqual(
+        qx_packed, utils.pack_4bit(qx, pack_dim=0, packed_dtype=jnp.int32)
+    )
+    self.assertAllClose(scale_packed, scale)
+    if use_symmetric:
+      self.assertIsNone(zp_packed)
+    else:
+      self.assertAllClose(zp_packed, zp)
+
 
 class ReducePrecisionEinsumTest(test_utils.TestCase):
 
@@ -806,6 +829,23 @@ class LowRankOperationsTest(test_utils.TestCase):
     if rank > 3:
       self.assertAllClose(x, jnp.einsum('ij,jk->ik', u, sv))
 
+  @parameterized.named_parameters(
+      ('1', 1),
+      ('2', 2),
+  )
+  def test_factorize_weight_balanced(self, rank):
+    x = jnp.array([[3, 2], [2, 3], [2, -2]], dtype=jnp.float32)
+    u, sv = operations.factorize_weight(x, rank=rank)
+    a, b = operations.factorize_weight(x, rank=rank, balanced=True)
+    self.assertArraysEqual(a.shape, u.shape)
+    self.assertArraysEqual(b.shape, sv.shape)
+    # Balanced factors give the same product but split the singular values
+    # evenly between the two factors.
+    self.assertAllClose(
+        jnp.einsum('ij,jk->ik', a, b), jnp.einsum('ij,jk->ik', u, sv)
+    )
+    self.assertAllClose(jnp.linalg.norm(a), jnp.linalg.norm(b))
+
 
 if __name__ == '__main__':
   absltest.main()
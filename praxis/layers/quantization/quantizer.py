@@ -17,6 +17,7 @@
 
 from __future__ import annotations
 
+import dataclasses
 import itertools
 from typing import Sequence
 
@@ -108,8 +109,13 @@ class QuantizationLayer(base_layer.BaseLayer):
             self.quantization.weight_params.int4_packed_weights_container_dtype
         )
         packing_factor = 2 if dtype == jnp.int8 else 8
-        weight_params.shape = utils.get_packed_shape(
-            weight_params.shape, pack_dim, packing_factor=packing_factor
+        # Callers may cache and reuse the hparams they pass in, so derive the
+        # packed shape on a copy instead of mutating in place.
+        weight_params = dataclasses.replace(
+            weight_params,
+            shape=utils.get_packed_shape(
+                weight_params.shape, pack_dim, packing_factor=packing_factor
+            ),
         )
       if do_static_activation_quantization(self.quantization.act_params):
         raise NotImplementedError(
@@ -161,6 +167,7 @@ class QuantizationLayer(base_layer.BaseLayer):
       weight_name: str = 'w',
       scale_eqn: str | None = None,
       zp_eqn: str | None = None,
+      preferred_element_type: jnp.dtype | None = None,
   ) -> JTensor:
     """Quantized Einsum for inference and training."""
 
@@ -233,6 +240,7 @@ class QuantizationLayer(base_layer.BaseLayer):
           zp_act=zp_act,
           scale_eqn=scale_eqn,
           zp_eqn=zp_eqn,
+          preferred_element_type=preferred_element_type,
       )
 
       return out
@@ -21,6 +21,7 @@ from typing import Optional, Sequence
 
 import jax
 from jax import numpy as jnp
+import numpy as np
 from praxis import base_layer
 from praxis import pytypes
 from praxis.layers.quantization.sparsity import sparsity
@@ -155,8 +156,19 @@ class SparsityBaseLayer(base_layer.BaseLayer):
     """
     assert self.sparsity is not None
     sparsity_weight_hp = copy.deepcopy(weight_hp)
-    sparsity_weight_hp.init = WeightInit.Constant(True)
-    sparsity_weight_hp.dtype = jnp.bool_
+    if self._use_packed_mask():
+      # Masks are stored bit-packed, 8 mask bits per byte; all-ones bytes
+      # encode the all-True initial mask.
+      num_bytes = int(-(-np.prod(weight_hp.shape) // 8))
+      sparsity_weight_hp.shape = [num_bytes]
+      # The flat byte array no longer lines up with the weight's dims, so it
+      # cannot inherit the weight's sharding; keep it replicated.
+      sparsity_weight_hp.tensor_split_dims_mapping = [-1]
+      sparsity_weight_hp.init = WeightInit.Constant(0xFF)
+      sparsity_weight_hp.dtype = jnp.uint8
+    else:
+      sparsity_weight_hp.init = WeightInit.Constant(True)
+      sparsity_weight_hp.dtype = jnp.bool_
     self.create_variable(
         name=name + SPARSITY_NAME_POSTFIX,
         var_hparams=sparsity_weight_hp,
@@ -187,6 +199,10 @@ class SparsityBaseLayer(base_layer.BaseLayer):
   def _create_counter_variables(self):
     """Create variable of num_shot and mask update count."""
     assert self.sparsity is not None
+    if self.has_variable(base_layer.NON_TRAINABLE, 'num_shots'):
+      # Counters are shared across the layer's weights; they were already
+      # created for a sibling weight.
+      return
     num_shots = self.sparsity.mode.get_num_shots()
     num_shots_hp = WeightHParams(
         shape=[],
@@ -229,11 +245,15 @@ class SparsityBaseLayer(base_layer.BaseLayer):
           or self.sparsity.weight_params.prune_rate is None
       ):
         return mask
+      # Scores from compute_score are magnitudes already, so the mask
+      # computation can skip its own abs pass.
       return sparsity.get_sparsity_mask(
           score,
           n_sparsity=self.sparsity.weight_params.prune_rate[0],
           m_sparsity=self.sparsity.weight_params.prune_rate[1],
           order=self.sparsity.order,
+          use_approx_top_k=self.sparsity.use_approx_top_k,
+          already_abs=True,
       )
 
     if self.sparsity.sparsity_type == SparsityType.CHANNELWISE_PRUNING:
@@ -255,7 +275,13 @@ class SparsityBaseLayer(base_layer.BaseLayer):
     prune_rate = self._get_prune_rate_unstructured(step)
     if prune_rate is None:
       return mask
-    return sparsity.get_sparsity_mask_unstructured(score, mask, prune_rate)
+    return sparsity.get_sparsity_mask_unstructured(
+        score,
+        mask,
+        prune_rate,
+        already_abs=True,
+        use_approx_top_k=self.sparsity.use_approx_top_k,
+    )
 
   def _get_prune_rate_unstructured(self, step):
     prune_rate = (
@@ -289,6 +315,33 @@ class SparsityBaseLayer(base_layer.BaseLayer):
           ** exponent
       )
 
+  def _use_packed_mask(self) -> bool:
+    return (
+        self.sparsity is not None
+        and self.sparsity.weight_params is not None
+        and self.sparsity.weight_params.packed_mask
+    )
+
+  def _read_mask(self, var_name: str, shape: Sequence[int]) -> JTensor:
+    """Reads a mask variable as a boolean tensor of `shape`."""
+    mask = self.get_var(var_name)
+    if self._use_packed_mask():
+      return sparsity.unpack_sparsity_mask(mask, shape)
+    # Reshape if mask and weight have shape mismatch.
+    # E.g., this happens in attentions.AttentionProjection when setting
+    # attention_combine_dims=True.
+    # TODO(shaojinding): Move this reshape to attentions.py if it blocks
+    # future refactors on sparse_base_layer.py.
+    if mask.shape != shape:
+      mask = jnp.reshape(mask, shape)
+    return mask
+
+  def _write_mask(self, var_name: str, mask: JTensor) -> None:
+    """Stores a boolean mask, bit-packing it when configured to."""
+    if self._use_packed_mask():
+      mask = sparsity.pack_sparsity_mask(mask)
+    self.update_var(var_name, mask)
+
   def _maybe_update_mask(
       self,
       weight: JTensor,
@@ -303,15 +356,7 @@ class SparsityBaseLayer(base_layer.BaseLayer):
       return
 
     mask_var_name = name + SPARSITY_NAME_POSTFIX
-    mask = self.get_var(mask_var_name)
-
-    # Reshape if mask and weight have shape mismatch.
-    # E.g., this happens in attentions.AttentionProjection when setting
-    # attention_combine_dims=True.
-    # TODO(shaojinding): Move this reshape to attentions.py if it blocks
-    # future refactors on sparse_base_layer.py.
-    if mask.shape != weight.shape:
-      mask = jnp.reshape(mask, weight.shape)
+    mask = self._read_mask(mask_var_name, weight.shape)
 
     update_cnt = self.get_var('mask_update_count')
 
@@ -355,7 +400,7 @@ class SparsityBaseLayer(base_layer.BaseLayer):
     )
 
     self.update_var('mask_update_count', update_cnt)
-    self.update_var(mask_var_name, new_mask)
+    self._write_mask(mask_var_name, new_mask)
     if self.sparsity.track_sad_metric:
       self.update_var('sparse_architecture_divergence', sad_score)
 
@@ -564,18 +609,150 @@ class SparsityBaseLayer(base_layer.BaseLayer):
     # [case of few shot/one shot]; and for layer we dont want to sparsify
     # so we apply mask for all the cases.
     mask_var_name = name + SPARSITY_NAME_POSTFIX
-    mask = self.get_var(mask_var_name)
-
-    if mask.shape != weight.shape:
-      mask = jnp.reshape(mask, weight.shape)
 
     if self.sparsity.weight_params.sparse_ste:
+      mask = self._read_mask(mask_var_name, weight.shape)
       weight, _, _ = sr_ste(
           weight, mask, self.sparsity.weight_params.sparse_ste_weight
       )
     else:
+      # A packed mask is handed to apply_sparsity as-is; it is unpacked
+      # lazily inside the masking kernel.
+      mask = self.get_var(mask_var_name)
+      if not self._use_packed_mask() and mask.shape != weight.shape:
+        mask = jnp.reshape(mask, weight.shape)
       weight = sparsity.apply_sparsity(weight, mask)
 
     self.update_var('step', step + 1)
 
     return weight
+
+  def sparsifiy_batched(
+      self,
+      weights: Sequence[JTensor],
+      names: Sequence[str],
+      inputs: JTensor | None = None,
+      layer_idx: int | None = None,
+  ) -> list[JTensor]:
+    """Sparsifies sibling weights with a single fused mask computation.
+
+    For magnitude-scored N:M sparsity in row-major order, the pruning blocks
+    of each weight are independent, so the weights can be flattened,
+    concatenated and pruned with one kernel instead of one launch per weight.
+    The step and mask-update counters advance once for the whole group, the
+    same as for a layer with a single weight. Configurations for which the
+    fused math would differ (activation-weighted scores, channelwise or
+    unstructured sparsity, SR-STE, top-k mask learning, column-wise order,
+    or weights that do not divide into whole N:M blocks) fall back to
+    sequential `sparsifiy` calls.
+
+    Args:
+      weights: tensors to be sparsified, each with its own mask.
+      names: names of the weights, to get the corresponding masks.
+      inputs: input tensor, i.e., activation of the given weights.
+      layer_idx: Layer index.
+
+    Returns:
+      A list of sparsified weights, in the order given.
+    """
+    fusible = (
+        self.sparsity is not None
+        and not isinstance(self.sparsity.mode, InferenceMode)
+        and self.sparsity.weight_params is not None
+        and self.sparsity.sparsity_type == SparsityType.STRUCTURED_NM
+        and self.sparsity.score == sparsity_hparams.SparsityScore.MAGNITUDE
+        and self.sparsity.order == 'R'
+        and not self.sparsity.topk_estimator_type
+        and not self.sparsity.weight_params.sparse_ste
+        # N:M blocks are laid out over the concatenated flat weights, so
+        # every weight must divide into whole blocks; otherwise a block
+        # would straddle a weight boundary.
+        and (
+            self.sparsity.weight_params.prune_rate is None
+            or all(
+                w.size % self.sparsity.weight_params.prune_rate[1] == 0
+                for w in weights
+            )
+        )
+    )
+    if not fusible:
+      return [
+          self.sparsifiy(w, name=n, inputs=inputs, layer_idx=layer_idx)
+          for w, n in zip(weights, names)
+      ]
+
+    step = self.get_var('step')
+
+    if (
+        self.sparsity.sparsified_layers is not None and layer_idx is not None
+    ) and (layer_idx not in self.sparsity.sparsified_layers):
+      self.update_var('step', step + 1)
+      return list(weights)
+
+    mask_var_names = [name + SPARSITY_NAME_POSTFIX for name in names]
+    masks = [
+        self._read_mask(var_name, w.shape)
+        for var_name, w in zip(mask_var_names, weights)
+    ]
+    flat_weight = jnp.concatenate([w.ravel() for w in weights])
+    flat_mask = jnp.concatenate([m.ravel() for m in masks])
+
+    if not isinstance(self.sparsity.mode, MaterializeMode):
+      update_cnt = self.get_var('mask_update_count')
+
+      if isinstance(self.sparsity.mode, FewShotMode):
+        self.sparsity.mode.increment_target_step(update_cnt)
+
+      def mask_update(w, mask, update_cnt, step):
+        score = sparsity.compute_score(w, score_func=self.sparsity.score)
+        new_mask = self._get_sparsity_mask(score, mask, step)
+
+        sad_score = None
+        if self.sparsity.track_sad_metric:
+          # compute sad = #mask-changes / #params
+          sad_score = jnp.sum(jnp.logical_xor(mask, new_mask)) / jnp.size(mask)
+
+        return new_mask, update_cnt + 1, sad_score
+
+      def no_mask_update(w, mask, update_cnt, step):  # pylint: disable=unused-argument
+        sad_score = None
+        if self.sparsity.track_sad_metric:
+          # sad metric becomes zero as there are no mask-changes
+          sad_score = jnp.zeros((), dtype=jnp.float32)
+
+        return mask, update_cnt, sad_score
+
+      flat_mask, update_cnt, sad_score = jax.lax.cond(
+          self.sparsity.mode.update_cond(step, update_cnt),
+          mask_update,
+          no_mask_update,
+          flat_weight,
+          flat_mask,
+          update_cnt,
+          step,
+      )
+
+      self.update_var('mask_update_count', update_cnt)
+      offset = 0
+      for var_name, w in zip(mask_var_names, weights):
+        segment = flat_mask[offset : offset + w.size]
+        self._write_mask(var_name, jnp.reshape(segment, w.shape))
+        offset += w.size
+      if self.sparsity.track_sad_metric:
+        self.update_var('sparse_architecture_divergence', sad_score)
+
+      if isinstance(self.sparsity.mode, OneShotMode) or isinstance(
+          self.sparsity.mode, FewShotMode
+      ):
+        self.add_summary('mask_update_count', update_cnt, verbosity=4)
+
+    flat_weight = sparsity.apply_sparsity(flat_weight, flat_mask)
+
+    self.update_var('step', step + 1)
+
+    out = []
+    offset = 0
+    for w in weights:
+      out.append(jnp.reshape(flat_weight[offset : offset + w.size], w.shape))
+      offset += w.size
+    return out
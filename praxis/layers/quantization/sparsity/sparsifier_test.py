@@ -27,6 +27,7 @@ from praxis import test_utils
 from praxis.layers import linears
 from praxis.layers import quantization
 from praxis.layers.quantization.sparsity import sparsifier
+from praxis.layers.quantization.sparsity import sparsity
 from praxis.layers.quantization.sparsity import sparsity_hparams
 from praxis.layers.quantization.sparsity import sparsity_modes
 
@@ -56,6 +57,8 @@ class SparseLinearTestLayer(sparsifier.SparsityBaseLayer, linears.Linear):
         shape=[self.input_dims, self.output_dims],
         init=self.params_init,
         dtype=self.dtype,
+        mesh_shape=self.mesh_shape,
+        tensor_split_dims_mapping=self.weight_split_dims_mapping.wt,
     )
     name = 'w'
     self.create_variable(name, weight_hp)
@@ -70,6 +73,33 @@ class SparseLinearTestLayer(sparsifier.SparsityBaseLayer, linears.Linear):
     return out
 
 
+class SparseTwoWeightTestLayer(sparsifier.SparsityBaseLayer, linears.Linear):
+
+  def setup(self):
+    weight_hp_a = base_layer.WeightHParams(
+        shape=[self.input_dims, self.input_dims],
+        init=self.params_init,
+        dtype=self.dtype,
+    )
+    weight_hp_b = base_layer.WeightHParams(
+        shape=[self.input_dims, self.output_dims],
+        init=self.params_init,
+        dtype=self.dtype,
+    )
+    self.create_variable('w_a', weight_hp_a)
+    self.create_variable('w_b', weight_hp_b)
+    self.create_child('einsum', self.einsum_tpl.clone())
+    self.create_aux_variables('w_a', weight_hp_a)
+    self.create_aux_variables('w_b', weight_hp_b)
+
+  def __call__(self, inputs):
+    w_a, w_b = self.sparsifiy_batched(
+        [self.theta.w_a, self.theta.w_b], names=['w_a', 'w_b'], inputs=inputs
+    )
+    intermediate = self.einsum('...y,yz->...z', inputs, w_a)
+    return self.einsum('...y,yz->...z', intermediate, w_b)
+
+
 class SparseBaseLayerCorrectnessTest(test_utils.TestCase):
   """Checks the expected behaviors of sparse_base_layer."""
 
@@ -452,6 +482,162 @@ class SparseBaseLayerCorrectnessTest(test_utils.TestCase):
           ),
       )
 
+  def test_sparsifiy_batched(self):
+    sparsity_p = pax_fiddle.Config(
+        SparsityHParams,
+        sparsity_type=SparsityType.STRUCTURED_NM,
+        mode=pax_fiddle.Config(TrainingMode, target_step=0),
+        weight_params=WeightSparsityParams(prune_rate=(2, 4)),
+    )
+
+    p = pax_fiddle.Config(
+        SparseTwoWeightTestLayer,
+        sparsity=sparsity_p,
+        input_dims=4,
+        output_dims=8,
+    )
+
+    test_layer = instantiate(p)
+    prng_key = jax.random.PRNGKey(seed=123)
+    inputs = jnp.array(np.random.rand(2, 4), dtype=p.dtype)
+    w_a = jnp.array(np.random.rand(4, 4), dtype=p.dtype)
+    w_b = jnp.array(np.random.rand(4, 8), dtype=p.dtype)
+
+    with base_layer.JaxContext.new_context():
+      params = test_layer.init(prng_key, inputs)
+      params[PARAMS]['w_a'] = w_a
+      params[PARAMS]['w_b'] = w_b
+
+      outputs, updated_params = test_layer.apply(params, inputs, mutable=True)
+
+      # The fused masks must match per-weight N:M mask computation.
+      self.assertArraysEqual(
+          updated_params[NON_TRAINABLE]['w_a' + SPARSITY_NAME_POSTFIX],
+          sparsity.get_sparsity_mask(w_a, n_sparsity=2, m_sparsity=4),
+      )
+      self.assertArraysEqual(
+          updated_params[NON_TRAINABLE]['w_b' + SPARSITY_NAME_POSTFIX],
+          sparsity.get_sparsity_mask(w_b, n_sparsity=2, m_sparsity=4),
+      )
+
+      pruned_w_a = sparsity.prune_inputs_n_m(w_a, n=2, m=4)
+      pruned_w_b = sparsity.prune_inputs_n_m(w_b, n=2, m=4)
+      self.assertArraysEqual(
+          outputs,
+          jnp.einsum(
+              '...y,yz->...z',
+              jnp.einsum('...y,yz->...z', inputs, pruned_w_a),
+              pruned_w_b,
+          ),
+      )
+
+  def test_sparsifiy_batched_indivisible_falls_back(self):
+    sparsity_p = pax_fiddle.Config(
+        SparsityHParams,
+        sparsity_type=SparsityType.STRUCTURED_NM,
+        mode=pax_fiddle.Config(TrainingMode, target_step=0),
+        weight_params=WeightSparsityParams(prune_rate=(2, 4)),
+    )
+
+    # w_a is [3, 3] (9 elements) and w_b is [3, 9] (27 elements): neither
+    # divides into 2:4 blocks even though their concatenation (36) does, so
+    # the fused path must fall back and raise like per-weight sparsifiy.
+    p = pax_fiddle.Config(
+        SparseTwoWeightTestLayer,
+        sparsity=sparsity_p,
+        input_dims=3,
+        output_dims=9,
+    )
+
+    test_layer = instantiate(p)
+    prng_key = jax.random.PRNGKey(seed=123)
+    inputs = jnp.array(np.random.rand(2, 3), dtype=p.dtype)
+
+    with self.assertRaisesRegex(ValueError, 'must be divisible'):
+      with base_layer.JaxContext.new_context():
+        test_layer.init(prng_key, inputs)
+
+  def test_packed_mask(self):
+    sparsity_p = pax_fiddle.Config(
+        SparsityHParams,
+        sparsity_type=SparsityType.STRUCTURED_NM,
+        mode=pax_fiddle.Config(TrainingMode, target_step=0),
+        weight_params=WeightSparsityParams(prune_rate=(2, 4), packed_mask=True),
+    )
+
+    p = pax_fiddle.Config(
+        SparseLinearTestLayer, sparsity=sparsity_p, input_dims=4, output_dims=4
+    )
+
+    test_layer = instantiate(p)
+    prng_key = jax.random.PRNGKey(seed=123)
+    inputs = jnp.array(np.random.rand(2, 4), dtype=p.dtype)
+    weights = jnp.array(np.random.rand(4, 4), dtype=p.dtype)
+
+    with base_layer.JaxContext.new_context():
+      params = test_layer.init(prng_key, inputs)
+      params[PARAMS]['w'] = weights
+
+      # The mask is stored at packed width, 8 mask bits per byte.
+      init_mask = params[NON_TRAINABLE]['w' + SPARSITY_NAME_POSTFIX]
+      self.assertEqual(init_mask.dtype, jnp.uint8)
+      self.assertEqual(init_mask.shape, (weights.size // 8,))
+      self.assertArraysEqual(
+          sparsity.unpack_sparsity_mask(init_mask, weights.shape),
+          jnp.ones(weights.shape, dtype=jnp.bool_),
+      )
+
+      outputs, updated_params = test_layer.apply(params, inputs, mutable=True)
+
+      packed = updated_params[NON_TRAINABLE]['w' + SPARSITY_NAME_POSTFIX]
+      self.assertEqual(packed.dtype, jnp.uint8)
+      self.assertArraysEqual(
+          sparsity.unpack_sparsity_mask(packed, weights.shape),
+          sparsity.get_sparsity_mask(weights, n_sparsity=2, m_sparsity=4),
+      )
+      self.assertArraysEqual(
+          outputs,
+          jnp.einsum(
+              '...y,yz->...z',
+              inputs,
+              sparsity.prune_inputs_n_m(weights, n=2, m=4),
+          ),
+      )
+
+  def test_packed_mask_sharded(self):
+    sparsity_p = pax_fiddle.Config(
+        SparsityHParams,
+        sparsity_type=SparsityType.STRUCTURED_NM,
+        mode=pax_fiddle.Config(TrainingMode, target_step=0),
+        weight_params=WeightSparsityParams(prune_rate=(2, 4), packed_mask=True),
+    )
+
+    p = pax_fiddle.Config(
+        SparseLinearTestLayer,
+        sparsity=sparsity_p,
+        input_dims=4,
+        output_dims=4,
+        ici_mesh_shape=[1, 1],
+        mesh_axis_names=['mdl', 'data'],
+        weight_split_dims_mapping=base_layer.BaseLayer.WeightSharding(
+            wt=['mdl', 'data']
+        ),
+    )
+
+    test_layer = instantiate(p)
+    inputs = jnp.array(np.random.rand(2, 4), dtype=p.dtype)
+    with base_layer.JaxContext.new_context():
+      metadata = test_layer.abstract_init_with_metadata(inputs)
+
+    # The packed mask is 1-D, so it cannot inherit the weight's rank-2
+    # sharding; it is stored replicated.
+    mask_hp = metadata[NON_TRAINABLE]['w' + SPARSITY_NAME_POSTFIX]
+    self.assertEqual(list(mask_hp.shape), [2])
+    self.assertEqual(list(mask_hp.tensor_split_dims_mapping), [-1])
+    self.assertEqual(
+        list(metadata[PARAMS]['w'].tensor_split_dims_mapping), ['mdl', 'data']
+    )
+
   def test_materialize_mode(self):
     sparsity_p = pax_fiddle.Config(
         SparsityHParams,
@@ -16,11 +16,13 @@
 """Basic functionalities for pruning neural networks implemented in jax."""
 
 import functools
-from typing import Optional
+from typing import Optional, Sequence
 
 import jax
 import jax.numpy as jnp
+import numpy as np
 from praxis.layers.quantization.sparsity import sparsity_hparams
+from praxis.layers.quantization.sparsity import sparsity_numba
 
 
 def apply_sparsity(
@@ -40,6 +42,11 @@ def apply_sparsity(
 
   Returns: The masked input tensor.
   """
+  if mask.dtype == jnp.uint8:
+    # Bit-packed mask (see `pack_sparsity_mask`). The unpack feeds straight
+    # into the select, so XLA fuses it instead of materializing the mask at
+    # full width.
+    mask = unpack_sparsity_mask(mask, inputs.shape)
   if channelwise_dim is not None:
     target_axis = channelwise_dim % inputs.ndim
     non_target_axes = [i for i in range(inputs.ndim) if i != target_axis]
@@ -47,7 +54,25 @@ def apply_sparsity(
     channel_mask = channel_mask.reshape(-1)
     return jnp.take(inputs, jnp.nonzero(channel_mask)[0], axis=channelwise_dim)
 
-  return jnp.where(mask, inputs, jnp.zeros(inputs.shape, inputs.dtype))
+  return jnp.where(mask, inputs, jnp.asarray(0, dtype=inputs.dtype))
+
+
+def pack_sparsity_mask(mask: jnp.ndarray) -> jnp.ndarray:
+  """Packs a boolean mask into a flat uint8 array, 8 mask bits per byte.
+
+  The last byte is zero-padded when the mask size is not a multiple of 8.
+  """
+  return jnp.packbits(mask.reshape(-1))
+
+
+def unpack_sparsity_mask(
+    packed_mask: jnp.ndarray, shape: Sequence[int]
+) -> jnp.ndarray:
+  """Unpacks a mask packed by `pack_sparsity_mask` back to a boolean `shape`."""
+  count = np.prod(shape, dtype=np.int64)
+  return jnp.unpackbits(packed_mask, count=count).reshape(shape).astype(
+      jnp.bool_
+  )
 
 
 def get_sparsity_mask(
@@ -55,6 +80,8 @@ def get_sparsity_mask(
     n_sparsity: int = 0,
     m_sparsity: int = 0,
     order: str = 'R',
+    use_approx_top_k: bool = False,
+    already_abs: bool = False,
 ) -> jnp.ndarray:
   """Returns sparsified inputs for n:m structured pruning.
 
@@ -66,6 +93,12 @@ def get_sparsity_mask(
       `C` and `R` indicate column-wise and row-wise masking, respectively.
       Default is `R` indicating to applying N:M sparsity across rows of the
       input matrix.
+    use_approx_top_k: If True, select block survivors with
+      `jax.lax.approx_max_k`, which lowers to accelerator-native partial
+      sorting, instead of the exact `jax.lax.top_k`. Mask selection becomes
+      approximate near ties.
+    already_abs: If True, inputs are known to be non-negative (e.g. magnitude
+      scores) and the internal `jnp.abs` pass is skipped.
 
   Returns:
     A mask that indicates the pruning locations (`0`: no pruning, `1`: pruned).
@@ -82,25 +115,42 @@ def get_sparsity_mask(
   if order not in ['C', 'R']:
     raise ValueError(f'Index order {order} not supported.')
 
+  if isinstance(inputs, np.ndarray) and sparsity_numba.has_numba():
+    # Host arrays only reach here at model-prep time, outside jit, where the
+    # compiled single-pass kernel avoids per-op dispatch on large weights.
+    return sparsity_numba.get_sparsity_mask(
+        inputs, n_sparsity, m_sparsity, order=order, already_abs=already_abs
+    )
+
   group = int(length / m_sparsity)
-  inputs = jnp.abs(inputs)
+  if not already_abs:
+    inputs = jnp.abs(inputs)
   original_shape = inputs.shape
   if order == 'R':
     inputs_temp = inputs.reshape(group, m_sparsity, order='C')
   else:
-    inputs_trans = jnp.einsum('...ij->...ji', inputs)
+    inputs_trans = jnp.swapaxes(inputs, -1, -2)
     original_shape = inputs_trans.shape
     inputs_temp = inputs_trans.reshape(group, m_sparsity, order='C')
-  # Extract the smallest elements and forcefully make them zero.
-  _, top_k_indices = jax.lax.top_k(inputs_temp, k=n_sparsity)
-  mask = jnp.any(
-      jax.nn.one_hot(top_k_indices, m_sparsity, dtype=jnp.bool_), axis=-2
+  # Scatter True at the top-k indices instead of materializing a
+  # (group, N, M) one-hot tensor. Exactly N elements survive per block; ties
+  # at the n-th largest value resolve to the lower indices, as in top_k.
+  if use_approx_top_k:
+    _, top_k_indices = jax.lax.approx_max_k(
+        inputs_temp, k=n_sparsity, recall_target=0.95
+    )
+  else:
+    _, top_k_indices = jax.lax.top_k(inputs_temp, k=n_sparsity)
+  mask = (
+      jnp.zeros_like(inputs_temp, dtype=jnp.bool_)
+      .at[jnp.arange(group)[:, jnp.newaxis], top_k_indices]
+      .set(True)
   )
 
   if order == 'R':
     return mask.reshape(original_shape, order='C')
   else:
-    return jnp.einsum('...ij->...ji', mask.reshape(original_shape, order='C'))
+    return jnp.swapaxes(mask.reshape(original_shape, order='C'), -1, -2)
 
 
 @jax.jit
@@ -148,13 +198,12 @@ def get_sparsity_mask_channelwise(
   return mask.astype(jnp.bool_)
 
 
-# TODO(ayazdan): Add support for fast top-k.
-
-
 def get_sparsity_mask_unstructured(
     inputs: jnp.ndarray,
     mask: jnp.ndarray | None,
     prune_rate: jnp.ndarray | float,
+    already_abs: bool = False,
+    use_approx_top_k: bool = False,
 ) -> jnp.ndarray:
   """Computes a sparisty mask to prune the required percentage of weights.
 
@@ -169,14 +218,33 @@ def get_sparsity_mask_unstructured(
       inputs: Input tensor.
       mask: Current mask.
       prune_rate: Percentage of weights to prune, value between 0 and 100.
+      already_abs: If True, inputs are known to be non-negative (e.g.
+        magnitude scores) and the internal `jnp.abs` pass is skipped.
+      use_approx_top_k: If True and `prune_rate` is a static value, the
+        threshold is estimated as the minimum of the top
+        `size * (1 - prune_rate / 100)` magnitudes found with
+        `jax.lax.approx_max_k`, which lowers to an accelerator-native partial
+        sort instead of the full sort behind `jnp.percentile`. The resulting
+        sparsity is approximate near the threshold.
 
   Returns:
       Sparsity mask.
   """
+  inputs_abs = inputs if already_abs else jnp.abs(inputs)
   if mask is not None:
-    inputs = apply_sparsity(inputs, mask)
-  inputs_abs = jnp.abs(inputs)
-  threshold = jnp.percentile(inputs_abs, prune_rate)
+    # Zero out already-pruned positions directly on the magnitudes; this is
+    # equivalent to masking the inputs first but saves a pass over the tensor.
+    inputs_abs = jnp.where(mask, inputs_abs, jnp.asarray(0, inputs_abs.dtype))
+  if use_approx_top_k and not isinstance(prune_rate, jax.core.Tracer):
+    # `approx_max_k` needs a static k; traced prune rates (e.g. a polynomial
+    # decay schedule) keep the percentile path.
+    k = max(int(round(inputs_abs.size * (1 - float(prune_rate) / 100.0))), 1)
+    top_k_values, _ = jax.lax.approx_max_k(
+        inputs_abs.reshape(-1), k=k, recall_target=0.9
+    )
+    threshold = top_k_values.min()
+  else:
+    threshold = jnp.percentile(inputs_abs, prune_rate)
   return jnp.greater(inputs_abs, threshold)
 
 
@@ -203,7 +271,7 @@ def prune_inputs_n_m(
     An array with the same shape as inputs pruned with N:M strategy.
   """
   mask = get_sparsity_mask(inputs, n, m, order=order)
-  return jnp.where(mask, inputs, jnp.zeros(inputs.shape, inputs.dtype))
+  return jnp.where(mask, inputs, jnp.asarray(0, dtype=inputs.dtype))
 
 
 SparsityScore = sparsity_hparams.SparsityScore
@@ -256,5 +324,8 @@ def score_activation_weighted(
         ' inputs must have the same number of dimension of the first channel of'
         ' weight.'
     )
-  score = jnp.einsum('...j,jk->jk', jnp.abs(inputs), jnp.abs(weight))
-  return score
+  # Sum the activation magnitudes over the leading axes, then broadcast the
+  # resulting vector against the weight magnitudes. This is equivalent to
+  # einsum('...j,jk->jk', ...) without the einsum dispatch overhead.
+  inputs_sum = jnp.abs(inputs).reshape(-1, inputs.shape[-1]).sum(axis=0)
+  return inputs_sum[:, jnp.newaxis] * jnp.abs(weight)
@@ -100,6 +100,9 @@ class WeightSparsityParams:
     sparse_ste_weight: Denotes the relative weight for the sparse-refined term.
       As mentioned in the paper (https://arxiv.org/abs/2102.04010), the best
       default value is 0.0002 (lambda_w in the paper).
+    packed_mask: If True, the sparsity mask is stored bit-packed in uint8 (8
+      mask bits per byte) instead of one bool per weight, reducing mask memory
+      8x. The mask is unpacked lazily inside the masking op.
   """
 
   # TODO(ayazdan): Add additional sparsity parameters (order, offset, etc.)
@@ -108,8 +111,14 @@ class WeightSparsityParams:
   mask_decay_weight: float = 0.0
   sparse_ste: bool = False
   sparse_ste_weight: float = 0.0002
+  packed_mask: bool = False
+  # Set once validation has run, so that dataclass reconstructions (e.g.
+  # during jax tree flatten/unflatten on every trace) skip the checks.
+  _validated: bool = dataclasses.field(default=False, compare=False, repr=False)
 
   def __post_init__(self):
+    if self._validated:
+      return
     assert self.mask_decay_weight >= 0.0, (
         'Invalid value for '
         f'{self.mask_decay_weight}. '
@@ -129,6 +138,7 @@ class WeightSparsityParams:
         raise ValueError(
             'SR-STE only works with non-decaying sparse structure.'
         )
+    self._validated = True
 
 
 @dataclasses.dataclass
@@ -151,6 +161,10 @@ class SparsityHParams:
       input matrix.
     track_sad_metric: Should we track sparse architecture divergence metric?
     topk_estimator_type: Sets the type of top-k mask learning.
+    use_approx_top_k: If True, mask computation uses `jax.lax.approx_max_k`
+      instead of exact top-k (N:M) or a full sort (unstructured thresholds).
+      Faster on accelerators with dedicated partial-sort support, at the cost
+      of approximate selection near ties or the threshold.
   """
 
   sparsity_type: SparsityType = SparsityType.STRUCTURED_NM
@@ -164,11 +178,17 @@ class SparsityHParams:
   order: str = 'R'
   track_sad_metric: bool = False
   topk_estimator_type: str | None = None
+  use_approx_top_k: bool = False
   # TODO enable per layer dim i.e. linear 1 and 2
   # Enable unstacking
   channelwise_pruning_dim: int = -1
+  # Set once validation has run, so that dataclass reconstructions (e.g.
+  # during jax tree flatten/unflatten on every trace) skip the checks.
+  _validated: bool = dataclasses.field(default=False, compare=False, repr=False)
 
   def __post_init__(self):
+    if self._validated:
+      return
     if (
         self.weight_params is not None
     ):
@@ -203,3 +223,9 @@ class SparsityHParams:
 
       if self.order not in ['C', 'R']:
         raise ValueError(f'Index order {self.order} not supported.')
+
+      if self.weight_params.packed_mask and self.topk_estimator_type:
+        raise ValueError(
+            'Top-k mask learning requires unpacked boolean masks.'
+        )
+    self._validated = True
@@ -0,0 +1,103 @@
+# coding=utf-8
+# Copyright 2022 The Pax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Numba-backed N:M mask computation for host-side NumPy weights.
+
+Sparsification utilities are also used at model-prep time, outside of any
+jit'd step, where per-op JAX dispatch dominates the runtime on large weight
+matrices. This module computes the structured N:M mask block-by-block in a
+single compiled pass with a running top-N instead of `top_k` plus reshapes.
+"""
+
+from absl import logging
+import numpy as np
+
+# pylint: disable=g-import-not-at-top
+try:
+  import numba
+  from numba import prange
+except ImportError:
+  numba = None
+  prange = range
+  logging.warning('numba not found, please `pip install numba`')
+# pylint: enable=g-import-not-at-top
+
+
+def has_numba() -> bool:
+  """Returns True if the compiled mask path is available."""
+  return numba is not None
+
+
+def _nm_mask(blocks: np.ndarray, n: int) -> np.ndarray:
+  """Computes per-block keep masks for [num_blocks, M] magnitudes.
+
+  Each block keeps exactly its N largest values, with ties at the N-th
+  largest value resolving to the lower indices, matching the `top_k`
+  selection in `sparsity.get_sparsity_mask`. The survivors are maintained
+  with an N-slot running top-N (swap-min), so each block is a single pass
+  over M elements.
+  """
+  num_blocks, m = blocks.shape
+  mask = np.zeros((num_blocks, m), dtype=np.bool_)
+  for b in prange(num_blocks):  # pylint: disable=not-an-iterable
+    top_values = np.copy(blocks[b, :n])
+    top_indices = np.arange(n)
+    for j in range(n, m):
+      value = blocks[b, j]
+      # Evict the smallest kept value; among equal values the latest index,
+      # so that ties resolve to lower indices like top_k.
+      k_min = 0
+      for k in range(1, n):
+        if top_values[k] < top_values[k_min] or (
+            top_values[k] == top_values[k_min]
+            and top_indices[k] > top_indices[k_min]
+        ):
+          k_min = k
+      if value > top_values[k_min]:
+        top_values[k_min] = value
+        top_indices[k_min] = j
+    for k in range(n):
+      mask[b, top_indices[k]] = True
+  return mask
+
+
+if numba is not None:
+  _nm_mask = numba.njit(parallel=True, cache=True)(_nm_mask)
+
+
+def get_sparsity_mask(
+    inputs: np.ndarray,
+    n_sparsity: int = 0,
+    m_sparsity: int = 0,
+    order: str = 'R',
+    already_abs: bool = False,
+) -> np.ndarray:
+  """NumPy/Numba counterpart of `sparsity.get_sparsity_mask`.
+
+  Takes and returns host arrays; see `sparsity.get_sparsity_mask` for the
+  argument semantics. Inputs are validated by the caller.
+  """
+  if not already_abs:
+    inputs = np.abs(inputs)
+  group = inputs.size // m_sparsity
+  if order == 'R':
+    blocks = np.ascontiguousarray(inputs).reshape(group, m_sparsity)
+    mask = _nm_mask(blocks, n_sparsity)
+    return mask.reshape(inputs.shape)
+  else:
+    inputs_trans = np.ascontiguousarray(np.swapaxes(inputs, -1, -2))
+    blocks = inputs_trans.reshape(group, m_sparsity)
+    mask = _nm_mask(blocks, n_sparsity)
+    return np.swapaxes(mask.reshape(inputs_trans.shape), -1, -2)
@@ -0,0 +1,82 @@
+# coding=utf-8
+# Copyright 2022 The Pax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for sparsity_numba."""
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from jax import numpy as jnp
+import numpy as np
+from praxis.layers.quantization.sparsity import sparsity
+from praxis.layers.quantization.sparsity import sparsity_numba
+
+
+class SparsityNumbaTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    if not sparsity_numba.has_numba():
+      self.skipTest('numba is not available.')
+    np.random.seed(0)
+
+  @parameterized.parameters(
+      dict(n=1, m=4, order='R'),
+      dict(n=2, m=4, order='R'),
+      dict(n=1, m=4, order='C'),
+      dict(n=2, m=4, order='C'),
+  )
+  def test_matches_jax_mask(self, n, m, order):
+    inputs = np.random.randn(10, 2, 8).astype(np.float32)
+    mask = sparsity_numba.get_sparsity_mask(
+        inputs, n_sparsity=n, m_sparsity=m, order=order
+    )
+    expected = sparsity.get_sparsity_mask(
+        jnp.asarray(inputs), n_sparsity=n, m_sparsity=m, order=order
+    )
+    np.testing.assert_array_equal(mask, np.asarray(expected))
+
+  def test_numpy_inputs_dispatch_to_numba(self):
+    inputs = np.random.randn(4, 8).astype(np.float32)
+    mask = sparsity.get_sparsity_mask(inputs, n_sparsity=2, m_sparsity=4)
+    self.assertIsInstance(mask, np.ndarray)
+    expected = sparsity.get_sparsity_mask(
+        jnp.asarray(inputs), n_sparsity=2, m_sparsity=4
+    )
+    np.testing.assert_array_equal(mask, np.asarray(expected))
+
+  def test_ties_keep_exactly_n(self):
+    # Exactly N elements survive per block; ties at the n-th largest value
+    # resolve to the lower indices, as with jax.lax.top_k.
+    inputs = np.array(
+        [[5.0, 0.0, 0.0, 0.0], [1.0, 1.0, 1.0, 1.0]], dtype=np.float32
+    )
+    mask = sparsity_numba.get_sparsity_mask(inputs, n_sparsity=2, m_sparsity=4)
+    np.testing.assert_array_equal(
+        mask, [[True, True, False, False], [True, True, False, False]]
+    )
+
+  def test_tied_values_match_jax_mask(self):
+    # Integer-valued inputs produce many ties; tie-breaking must agree with
+    # the JAX path exactly.
+    inputs = np.random.randint(0, 3, size=(16, 8)).astype(np.float32)
+    mask = sparsity_numba.get_sparsity_mask(inputs, n_sparsity=2, m_sparsity=4)
+    expected = sparsity.get_sparsity_mask(
+        jnp.asarray(inputs), n_sparsity=2, m_sparsity=4
+    )
+    np.testing.assert_array_equal(mask, np.asarray(expected))
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -249,6 +249,65 @@ class PruningFunctionalityTest(parameterized.TestCase):
         list(np.argmax(mask == 1, axis=2).flatten()),
     )
 
+  def test_n_m_pruning_mask_ties(self):
+    # Exactly N elements survive per block even with ties at the n-th
+    # largest value (routine for weights containing zeros); ties resolve to
+    # the lower indices.
+    inputs = jnp.array([[5.0, 0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0]])
+    mask = sparsity.get_sparsity_mask(inputs, n_sparsity=2, m_sparsity=4)
+    np.testing.assert_array_equal(
+        mask, [[True, True, False, False], [True, True, False, False]]
+    )
+
+  def test_unstructured_mask_approx_top_k(self):
+    inputs = jnp.array(np.random.rand(32, 32))
+    prune_rate = 75.0
+    mask = sparsity.get_sparsity_mask_unstructured(
+        inputs, None, prune_rate, use_approx_top_k=True
+    )
+    exact_mask = sparsity.get_sparsity_mask_unstructured(
+        inputs, None, prune_rate
+    )
+    # The approximate threshold keeps the requested density up to recall
+    # slack around the cut-off.
+    num_kept = int(jnp.sum(mask))
+    expected_kept = int(inputs.size * (1 - prune_rate / 100))
+    self.assertLessEqual(abs(num_kept - expected_kept), 0.1 * inputs.size)
+    # Away from the threshold, both paths agree.
+    np.testing.assert_array_equal(
+        np.asarray(mask)[np.asarray(inputs) > 0.9],
+        np.asarray(exact_mask)[np.asarray(inputs) > 0.9],
+    )
+
+  def test_packed_mask_roundtrip(self):
+    inputs = jnp.array(np.random.rand(10, 2, 4))
+    mask = sparsity.get_sparsity_mask(inputs, n_sparsity=2, m_sparsity=4)
+    packed = sparsity.pack_sparsity_mask(mask)
+    self.assertEqual(packed.dtype, jnp.uint8)
+    self.assertEqual(packed.size, inputs.size // 8)
+    np.testing.assert_array_equal(
+        sparsity.unpack_sparsity_mask(packed, mask.shape), mask
+    )
+    # apply_sparsity accepts the packed mask directly.
+    np.testing.assert_array_equal(
+        sparsity.apply_sparsity(inputs, packed),
+        sparsity.apply_sparsity(inputs, mask),
+    )
+
+  def test_n_m_pruning_mask_approx_top_k(self):
+    inputs = jnp.array(np.random.rand(10, 2, 4))
+    prune_rate = (1, 4)
+    mask = sparsity.get_sparsity_mask(
+        inputs,
+        n_sparsity=prune_rate[0],
+        m_sparsity=prune_rate[1],
+        use_approx_top_k=True,
+    )
+    self.assertEqual(
+        list(np.argmax(inputs, axis=2).flatten()),
+        list(np.argmax(mask == 1, axis=2).flatten()),
+    )
+
   @parameterized.named_parameters(
       dict(
           testcase_name='2d_row_wise_pruning',